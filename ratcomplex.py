@@ -29,60 +29,176 @@ ratcomplex_version = "1.1"
 ##################################################################################
 
 from fractions import Fraction
-from weakref import WeakValueDictionary as _WVDic
+from functools import lru_cache as _lru_cache
+from math import hypot as _hypot
+
+
+# CPython's Fraction keeps its state in _numerator/_denominator slots;
+# reading them directly skips a property descriptor call per access.  The
+# hasattr probe keeps non-CPython Fractions working.
+if hasattr(Fraction(0), "_numerator"):
+
+    def _num_den(x, _F=Fraction):
+        """return (numerator, denominator) of a Fraction, or (x, 1) otherwise"""
+        if x.__class__ is _F:
+            return x._numerator, x._denominator
+        return x, 1
+
+    def _reduce_comp(real, imag, _F=Fraction):
+        """collapse denominator-1 Fractions and a zero imaginary part"""
+        if real.__class__ is _F and real._denominator == 1:
+            real = real._numerator
+        if imag.__class__ is _F and imag._denominator == 1:
+            imag = imag._numerator
+        if imag == 0:
+            return real
+        else:
+            return _make(real, imag)
+
+else:
+
+    def _num_den(x, _F=Fraction):
+        """return (numerator, denominator) of a Fraction, or (x, 1) otherwise"""
+        if x.__class__ is _F:
+            return x.numerator, x.denominator
+        return x, 1
+
+    def _reduce_comp(real, imag, _F=Fraction):
+        """collapse denominator-1 Fractions and a zero imaginary part"""
+        if real.__class__ is _F and real.denominator == 1:
+            real = real.numerator
+        if imag.__class__ is _F and imag.denominator == 1:
+            imag = imag.numerator
+        if imag == 0:
+            return real
+        else:
+            return _make(real, imag)
+
+
+# kernels for the all-int component case: plain integer arithmetic with no
+# Fraction (and therefore no gcd) involvement at all
+def _int_cplx_mul(ar, ai, br, bi):
+    return ar * br - ai * bi, ar * bi + ai * br
+
+
+def _int_cplx_add(ar, ai, br, bi):
+    return ar + br, ai + bi
+
+
+def _raw_fix(num, den):
+    """normalize an unreduced num/den pair produced by raw arithmetic"""
+    if den == 1:
+        return num
+    if type(num) is float or type(den) is float:
+        return num / den
+    return Fraction(num, den)
+
+
+def _make(real, imag):
+    """build a Complex directly, bypassing the intern cache
+
+    Used for anonymous arithmetic results, where the cache lookup is pure
+    overhead; explicit Complex(...) calls still intern.
+    """
+    obj = object.__new__(Complex)
+    obj.real = real
+    obj.imag = imag
+    obj._hash = None
+    obj._cplx = None
+    return obj
+
 
 # data type: Complex
 class Complex:
     """Definition of Complex data type"""
 
+    __slots__ = ("real", "imag", "_hash", "_cplx")
+
     # str_format_spec:
     #  {0}:value_real, {1}:value_imag
     #  {2}:sign_real,  {3}:sign_imag
     #  {4}:abs_real,   {5}:abs_imag
-    str_format_spec = "{0}{3}{5}i"
+    _default_str_spec = "{0}{3}{5}i"
+    str_format_spec = _default_str_spec
     repr_format_spec = "Complex({}, {})"
-    __ComplexInstance = _WVDic({})
+    # (spec, indices it references) memo for __str__; rebuilt whenever the
+    # user rebinds str_format_spec
+    _str_spec_used = (None, None)
 
     def __new__(self, real=0, imag=0):
+        if type(real) is Complex and imag == 0:
+            # already canonical; nothing to reduce or intern
+            return real
         v1 = real
         v2 = imag
-        if type(v1) in {complex, Complex}:
-            if type(v2) in {complex, Complex}:
+        if isinstance(v1, _COMPLEX_TYPES):
+            if isinstance(v2, _COMPLEX_TYPES):
                 real = v1.real - v2.imag
                 imag = v1.imag + v2.real
             else:
                 real = v1.real
                 imag = v1.imag + v2
         else:
-            if type(v2) in {complex, Complex}:
+            if isinstance(v2, _COMPLEX_TYPES):
                 real = v1 - v2.imag
                 imag = v2.real
             else:
                 real = v1
                 imag = v2
-        real = Complex.__reduce_frac(real)
-        imag = Complex.__reduce_frac(imag)
-        if imag == 0:
-            return real
-        if type(real) is Fraction:
-            rnu = real.numerator
-            rde = real.denominator
-        else:
-            rnu = real
-            rde = 1
-        if type(imag) is Fraction:
-            inu = imag.numerator
-            ide = imag.denominator
-        else:
-            inu = imag
-            ide = 1
-        v = (rnu, rde, inu, ide)
-        obj = Complex.__ComplexInstance.get(v)
-        if obj is None:
-            obj = super().__new__(self)
-            obj.real = real
-            obj.imag = imag
-            Complex.__ComplexInstance[v] = obj
+        rnu, rde = _num_den(real)
+        inu, ide = _num_den(imag)
+        if inu == 0:
+            return rnu if rde == 1 else real
+        if (
+            type(rnu) is int
+            and type(inu) is int
+            and -32768 <= rnu < 32768
+            and -32768 <= inu < 32768
+            and rde < 65536
+            and ide < 65536
+        ):
+            # small components pack into a single int key; int hashing is
+            # cheaper than tuple hashing and skips the tuple allocation
+            return Complex._intern_small(
+                (rnu & 0xFFFF)
+                | ((rde & 0xFFFF) << 16)
+                | ((inu & 0xFFFF) << 32)
+                | (ide << 48)
+            )
+        # the two bool arguments keep int and equal-valued float components
+        # from aliasing in the cache key (hash(1) == hash(1.0))
+        return Complex._intern(
+            rnu, rde, inu, ide, type(rnu) is float, type(inu) is float
+        )
+
+    @classmethod
+    @_lru_cache(maxsize=None)
+    def _intern_small(cls, key):
+        rnu = key & 0xFFFF
+        if rnu >= 0x8000:
+            rnu -= 0x10000
+        rde = (key >> 16) & 0xFFFF
+        inu = (key >> 32) & 0xFFFF
+        if inu >= 0x8000:
+            inu -= 0x10000
+        ide = key >> 48
+        obj = super().__new__(cls)
+        obj.real = rnu if rde == 1 else Fraction(rnu, rde)
+        obj.imag = inu if ide == 1 else Fraction(inu, ide)
+        obj._hash = None
+        obj._cplx = None
+        return obj
+
+    @classmethod
+    @_lru_cache(maxsize=None)
+    def _intern(cls, rnu, rde, inu, ide, rfloat, ifloat):
+        # the components are already reduced, so the Fraction constructor
+        # only pays a gcd over coprime integers here
+        obj = super().__new__(cls)
+        obj.real = rnu if rde == 1 else Fraction(rnu, rde)
+        obj.imag = inu if ide == 1 else Fraction(inu, ide)
+        obj._hash = None
+        obj._cplx = None
         return obj
 
     def __str__(self):
@@ -90,29 +206,48 @@ class Complex:
         ###  {0}:value_real, {1}:value_imag
         ###  {2}:sign_real,  {3}:sign_imag
         ###  {4}:abs_real,   {5}:abs_imag
-        if self.real < 0:
-            realsgn = "-"
-        else:
-            realsgn = "+"
-        if self.imag < 0:
-            imagsgn = "-"
-        else:
-            imagsgn = "+"
-        real = str(self.real)
-        realabs = str(abs(self.real))
-        imag = str(self.imag)
-        imagabs = str(abs(self.imag))
-        return Complex.str_format_spec.format(
-            real, imag, realsgn, imagsgn, realabs, imagabs
-        )
+        spec = Complex.str_format_spec
+        if spec is Complex._default_str_spec:
+            # default spec uses only {0}, {3} and {5}; build it directly
+            imag = self.imag
+            if imag < 0:
+                return "{}-{}i".format(self.real, -imag)
+            return "{}+{}i".format(self.real, imag)
+        memo_spec, used = Complex._str_spec_used
+        if memo_spec is not spec:
+            if "{}" in spec or "{:" in spec:
+                # auto-numbered fields consume the arguments in order, so
+                # every one of them has to be supplied
+                used = frozenset(range(6))
+            else:
+                used = frozenset(i for i in range(6) if "{%d" % i in spec)
+            Complex._str_spec_used = (spec, used)
+        # only materialize the fields the spec actually references;
+        # abs(Fraction) in particular allocates a new Fraction
+        real = self.real
+        imag = self.imag
+        args = ["", "", "", "", "", ""]
+        if 0 in used:
+            args[0] = str(real)
+        if 1 in used:
+            args[1] = str(imag)
+        if 2 in used:
+            args[2] = "+-"[real < 0]
+        if 3 in used:
+            args[3] = "+-"[imag < 0]
+        if 4 in used:
+            args[4] = str(-real) if real < 0 else str(real)
+        if 5 in used:
+            args[5] = str(-imag) if imag < 0 else str(imag)
+        return spec.format(*args)
 
     def __repr__(self):
         return Complex.repr_format_spec.format(repr(self.real), repr(self.imag))
 
     def __setattr__(self, name, value):
-        if name in {"real", "imag"} and name in self.__dict__:
+        if name in {"real", "imag"} and hasattr(self, name):
             raise PermissionError("Complex: {} is read only!".format(name))
-        self.__dict__[name] = value
+        object.__setattr__(self, name, value)
 
     def __delattr__(self, name):
         if name in {"real", "imag"}:
@@ -121,27 +256,45 @@ class Complex:
             super().__delattr__(name)
 
     def __hash__(self):
-        if self.imag == 0:
-            return hash(self.real)
-        elif self == complex(self):
-            return hash(complex(self))
+        # instances are interned and immutable, so the hash is computed once
+        h = self._hash
+        if h is not None:
+            return h
+        real = self.real
+        imag = self.imag
+        if imag == 0:
+            h = hash(real)
+        elif (
+            type(real) is Fraction
+            and real.denominator & (real.denominator - 1)
+            or type(imag) is Fraction
+            and imag.denominator & (imag.denominator - 1)
+        ):
+            # a Fraction with a non-power-of-two denominator can never
+            # equal a float, so the complex() probe below cannot match
+            h = hash((real, imag))
         else:
-            return hash((self.real, self.imag))
+            c = complex(self)
+            if self == c:
+                h = hash(c)
+            else:
+                h = hash((real, imag))
+        self._hash = h
+        return h
 
     def __eq__(self, v):
-        if type(v) in {complex, Complex}:
+        if isinstance(v, _COMPLEX_TYPES):
             return self.real == v.real and self.imag == v.imag
         else:
             return self.real == v and self.imag == 0
 
-    def __ne__(self, v):
-        if type(v) in {complex, Complex}:
-            return self.real != v.real or self.imag != v.imag
-        else:
-            return self.real != v or self.imag != 0
-
     def __complex__(self):
-        return float(self.real) + 1.0j * float(self.imag)
+        # immutable, so the float conversion of both components is cached
+        c = self._cplx
+        if c is None:
+            c = float(self.real) + 1.0j * float(self.imag)
+            self._cplx = c
+        return c
 
     def __abs__(self):
         if self.real == 0:
@@ -149,103 +302,155 @@ class Complex:
         elif self.imag == 0:  # this case might not occur
             return abs(self.real)
         else:
-            return abs(float(self.real) + 1.0j * float(self.imag))
-
-    def __pos__(self):
-        return Complex.__reduce_comp(self.real, self.imag)
-
-    def __neg__(self):
-        return Complex.__reduce_comp(-self.real, -self.imag)
-
-    def __add__(self, v):
-        if type(v) in {complex, Complex}:
-            real = self.real + v.real
-            imag = self.imag + v.imag
-        else:
-            real = self.real + v
-            imag = self.imag
-        return Complex.__reduce_comp(real, imag)
-
-    def __radd__(self, v):
-        if type(v) in {complex, Complex}:
-            real = self.real + v.real
-            imag = self.imag + v.imag
+            return _hypot(float(self.real), float(self.imag))
+
+    def __pos__(self, _reduce=_reduce_comp):
+        return _reduce(self.real, self.imag)
+
+    def __neg__(self, _reduce=_reduce_comp):
+        return _reduce(-self.real, -self.imag)
+
+    def __add__(self, v, _reduce=_reduce_comp, _intadd=_int_cplx_add, _nd=_num_den, _fix=_raw_fix):
+        if isinstance(v, _COMPLEX_TYPES):
+            sr, si, vr, vi = self.real, self.imag, v.real, v.imag
+            if (
+                type(sr) is int
+                and type(si) is int
+                and type(vr) is int
+                and type(vi) is int
+            ):
+                real, imag = _intadd(sr, si, vr, vi)
+                return _make(real, imag) if imag else real
+            # raw num/den arithmetic: one normalization per component
+            # instead of one gcd inside every Fraction operation
+            a, b = _nd(sr)
+            c, d = _nd(si)
+            e, f = _nd(vr)
+            g, h = _nd(vi)
+            real = _fix(a * f + e * b, b * f)
+            imag = _fix(c * h + g * d, d * h)
         else:
             real = self.real + v
             imag = self.imag
-        return Complex.__reduce_comp(real, imag)
-
-    def __sub__(self, v):
-        if type(v) in {complex, Complex}:
-            real = self.real - v.real
-            imag = self.imag - v.imag
+        return _reduce(real, imag)
+
+    # addition and multiplication are commutative, so the reflected
+    # operators can share the forward code objects
+    __radd__ = __add__
+
+    def __sub__(self, v, _reduce=_reduce_comp, _nd=_num_den, _fix=_raw_fix):
+        if isinstance(v, _COMPLEX_TYPES):
+            a, b = _nd(self.real)
+            c, d = _nd(self.imag)
+            e, f = _nd(v.real)
+            g, h = _nd(v.imag)
+            real = _fix(a * f - e * b, b * f)
+            imag = _fix(c * h - g * d, d * h)
         else:
             real = self.real - v
             imag = self.imag
-        return Complex.__reduce_comp(real, imag)
-
-    def __rsub__(self, v):
-        if type(v) in {complex, Complex}:
-            real = -self.real + v.real
-            imag = -self.imag + v.imag
+        return _reduce(real, imag)
+
+    def __rsub__(self, v, _reduce=_reduce_comp, _nd=_num_den, _fix=_raw_fix):
+        if isinstance(v, _COMPLEX_TYPES):
+            a, b = _nd(self.real)
+            c, d = _nd(self.imag)
+            e, f = _nd(v.real)
+            g, h = _nd(v.imag)
+            real = _fix(e * b - a * f, b * f)
+            imag = _fix(g * d - c * h, d * h)
         else:
             real = -self.real + v
             imag = -self.imag
-        return Complex.__reduce_comp(real, imag)
-
-    def __mul__(self, v):
-        if type(v) in {complex, Complex}:
-            real = self.real * v.real - self.imag * v.imag
-            imag = self.real * v.imag + self.imag * v.real
+        return _reduce(real, imag)
+
+    def __mul__(self, v, _reduce=_reduce_comp, _intmul=_int_cplx_mul, _nd=_num_den, _fix=_raw_fix):
+        if isinstance(v, _COMPLEX_TYPES):
+            sr, si, vr, vi = self.real, self.imag, v.real, v.imag
+            if (
+                type(sr) is int
+                and type(si) is int
+                and type(vr) is int
+                and type(vi) is int
+            ):
+                real, imag = _intmul(sr, si, vr, vi)
+                return _make(real, imag) if imag else real
+            # raw cross products; with normalization deferred to _raw_fix
+            # the 3-multiplication form no longer saves a gcd
+            a, b = _nd(sr)
+            c, d = _nd(si)
+            e, f = _nd(vr)
+            g, h = _nd(vi)
+            real = _fix(a * e * d * h - c * g * b * f, b * f * d * h)
+            imag = _fix(a * g * d * f + c * e * b * h, b * h * d * f)
         else:
             real = self.real * v
             imag = self.imag * v
-        return Complex.__reduce_comp(real, imag)
-
-    def __rmul__(self, v):
-        if type(v) in {complex, Complex}:
-            real = self.real * v.real - self.imag * v.imag
-            imag = self.real * v.imag + self.imag * v.real
-        else:
-            real = self.real * v
-            imag = self.imag * v
-        return Complex.__reduce_comp(real, imag)
-
-    def __truediv__(self, v):
-        if type(v) in {complex, Complex}:
-            d = v.real * v.real + v.imag * v.imag
-            real = (self.real * v.real + self.imag * v.imag) / d
-            imag = (self.imag * v.real - self.real * v.imag) / d
+        return _reduce(real, imag)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, v, _reduce=_reduce_comp, _nd=_num_den, _fix=_raw_fix):
+        if isinstance(v, _COMPLEX_TYPES):
+            # numerator is self times the conjugate of v; everything is
+            # carried as raw num/den pairs and normalized once at the end
+            a, b = _nd(self.real)
+            c, d = _nd(self.imag)
+            e, f = _nd(v.real)
+            g, h = _nd(v.imag)
+            dnum = e * e * h * h + g * g * f * f
+            dden = f * f * h * h
+            den1 = b * f * d * h
+            real = _fix((a * e * d * h + c * g * b * f) * dden, den1 * dnum)
+            imag = _fix((c * e * b * h - a * g * d * f) * dden, den1 * dnum)
+        elif type(v) is int and v != 0:
+            # Fraction / int is just a denominator multiply; going through
+            # Fraction.__truediv__ would pay an extra gcd per component.
+            # int and float components keep builtin division semantics.
+            n, d = _nd(self.real)
+            real = _fix(n, d * v) if d != 1 else self.real / v
+            n, d = _nd(self.imag)
+            imag = _fix(n, d * v) if d != 1 else self.imag / v
         else:
             real = self.real / v
             imag = self.imag / v
-        return Complex.__reduce_comp(real, imag)
-
-    def __rtruediv__(self, v):
-        if type(v) in {complex, Complex}:
-            d = self.real * self.real + self.imag * self.imag
-            real = (self.real * v.real + self.imag * v.imag) / d
-            imag = (-self.imag * v.real + self.real * v.imag) / d
+        return _reduce(real, imag)
+
+    def __rtruediv__(self, v, _reduce=_reduce_comp, _nd=_num_den, _fix=_raw_fix):
+        if isinstance(v, _COMPLEX_TYPES):
+            # numerator is the conjugate of self times v
+            a, b = _nd(self.real)
+            c, d = _nd(self.imag)
+            e, f = _nd(v.real)
+            g, h = _nd(v.imag)
+            dnum = a * a * d * d + c * c * b * b
+            dden = b * b * d * d
+            den1 = b * f * d * h
+            real = _fix((a * e * d * h + c * g * b * f) * dden, den1 * dnum)
+            imag = _fix((a * g * d * f - c * e * b * h) * dden, den1 * dnum)
         else:
             d = self.real * self.real + self.imag * self.imag
             real = self.real * v / d
             imag = -self.imag * v / d
-        return Complex.__reduce_comp(real, imag)
+        return _reduce(real, imag)
 
     def __pow__(self, v):
         if type(v) is int:
-            if v < 0:
-                sgn = -1
-                v = -v
-            else:
-                sgn = 1
-            b = bin(v).replace("0b", "")
+            # exact square-and-multiply on the exponent bits; walking the
+            # bin() string cost an allocation and a compare per character
+            if v == 0:
+                return 1
+            n = v if v > 0 else -v
             s = 1
-            for d in b:
-                s = s * s
-                if d == "1":
-                    s = s * self
-            if sgn == -1:
+            base = self
+            while True:
+                if n & 1:
+                    s = s * base
+                n >>= 1
+                if not n:
+                    break
+                base = base * base
+            if v < 0:
                 s = 1 / s
             return s
         else:
@@ -264,24 +469,14 @@ class Complex:
         return Complex(self.real, -self.imag)
 
     @staticmethod
-    def __reduce_frac(x):
-        if type(x) is Fraction:
-            if x.denominator == 1:
-                return x.numerator
-        return x
+    def listall():
+        return Complex._intern.cache_info()
 
-    @staticmethod
-    def __reduce_comp(real, imag):
-        real = Complex.__reduce_frac(real)
-        imag = Complex.__reduce_frac(imag)
-        if imag == 0:
-            return real
-        else:
-            return Complex(real, imag)
 
-    @staticmethod
-    def listall():
-        return [x for x in Complex.__ComplexInstance]
+# tuple shared by the isinstance() checks in the arithmetic dunders;
+# building the old {complex, Complex} set literal on every call is not
+# constant-folded by CPython
+_COMPLEX_TYPES = (complex, Complex)
 
 
 # [EOF]
@@ -54,55 +54,103 @@ sxprlib_ignoreCase = False  # ignore case of Symbol if True
 
 from sys import stdout as __stdout
 from json import dumps as _dumps
+from functools import lru_cache as _lru_cache
 from unicodedata import east_asian_width as _east_asian_width
 
 # define east_asian_width column count
 eawcolumncount = {"W": 2, "F": 2, "A": 2, "H": 1, "Na": 1, "N": 1}
 
+# a character's east_asian_width category never changes, so memoize it;
+# ASCII gets a precomputed table.  The column count itself still reads
+# eawcolumncount live, which users may adjust.
+_EAW_ASCII = tuple(_east_asian_width(chr(i)) for i in range(128))
+_eaw = _lru_cache(maxsize=4096)(_east_asian_width)
+
 
 from re import compile as __compile
 from re import ASCII as __ASCII
 
-_is_integer = __compile(r"[+-]?\d+", __ASCII).fullmatch
-_is_bin = __compile(r"[+-]?#[bB][01]+(/[01]+)?", __ASCII).fullmatch
-_is_oct = __compile(r"[+-]?#[oO][0-7]+(/[0-7]+)?", __ASCII).fullmatch
-_is_hex = __compile(r"[+-]?#[xX][0-9a-fA-F]+(/[0-9a-fA-F]+)?", __ASCII).fullmatch
-_is_radix = __compile(
-    r"[+-]?#[1-9][0-9]?[rR][0-9a-zA-Z]+(/[0-9a-zA-Z]+)?", __ASCII
-).fullmatch
-_is_number = __compile(
-    r"[+-]?(\d+(\.\d*)?|\d*\.\d+)([defsDEFS][+-]?\d+)?", __ASCII
-).fullmatch
-_is_fraction = __compile(r"[+-]?\d+/\d+", __ASCII).fullmatch
 _is_arrayprefix = __compile(r"#[0-9]+[aA]", __ASCII).fullmatch
 _is_charhex = __compile(r"#\\[uxUX][0-9a-fA-F]+", __ASCII).fullmatch
 
-from weakref import WeakValueDictionary as _WVDic
+# one engine pass identifies the token class of a numeric atom via
+# lastgroup instead of up to seven separate fullmatches.
+# 'int' comes before 'float' so plain integers report as 'int'.
+_classify_number = __compile(
+    r"(?P<int>[+-]?\d+)"
+    r"|(?P<bin>[+-]?#[bB][01]+(?:/[01]+)?)"
+    r"|(?P<oct>[+-]?#[oO][0-7]+(?:/[0-7]+)?)"
+    r"|(?P<hex>[+-]?#[xX][0-9a-fA-F]+(?:/[0-9a-fA-F]+)?)"
+    r"|(?P<radix>[+-]?#[1-9][0-9]?[rR][0-9a-zA-Z]+(?:/[0-9a-zA-Z]+)?)"
+    r"|(?P<frac>[+-]?\d+/\d+)"
+    r"|(?P<float>[+-]?(?:\d+(?:\.\d*)?|\d*\.\d+)(?:[defsDEFS][+-]?\d+)?)",
+    __ASCII,
+).fullmatch
 
+# numeric base per radix group, for the shared decoder
+_NUMBER_BASES = {"bin": 2, "oct": 8, "hex": 16}
 
-def _inany(item, lists):
-    for l in lists:
-        if item in l:
-            return True
-    return False
-
+# fold the lisp exponent markers d/f/s into "e" in one translate pass
+_FLOAT_TRANS = str.maketrans("dDfFsS", "eeeeee")
 
-def __is_oct_digit(c):
-    if ("0" <= c) and (c <= "7"):
-        return True
-    else:
-        return False
+# classifier groups currently enabled by the sxprlib_enable* switches;
+# rebuilt lazily whenever the switches are found to have changed, since
+# users may toggle them at any time
+_number_groups_cache = (None, frozenset())
 
 
-def __is_hex_digit(c):
-    if ("0" <= c) and (c <= "9"):
-        return True
-    elif ("a" <= c) and (c <= "f"):
-        return True
-    elif ("A" <= c) and (c <= "F"):
-        return True
-    else:
-        return False
+def _active_number_groups():
+    global _number_groups_cache
+    flags = (
+        sxprlib_enableDec,
+        sxprlib_enableBin,
+        sxprlib_enableOct,
+        sxprlib_enableHex,
+        sxprlib_enableRadix,
+        sxprlib_enableFrac,
+        sxprlib_enableFloat,
+    )
+    memo_flags, groups = _number_groups_cache
+    if memo_flags != flags:
+        names = ("int", "bin", "oct", "hex", "radix", "frac", "float")
+        groups = frozenset(n for n, f in zip(names, flags) if f)
+        _number_groups_cache = (flags, groups)
+    return groups
+
+# escape table for printed symbols, built once at import; the search
+# fast-reject below lets the common clean symbol skip translate entirely
+_SYMBOL_TRANS = str.maketrans(
+    {
+        "(": "\\(",
+        ")": "\\)",
+        " ": "_",
+        "|": "\\|",
+        '"': '\\"',
+        "\a": "\\a",
+        "\b": "\\b",
+        "\f": "\\f",
+        "\n": "\\n",
+        "\r": "\\r",
+        "\t": "\\t",
+        "\v": "\\v",
+    }
+)
+_symbol_needs_escape = __compile(r'[()| "\a\b\f\n\r\t\v]').search
+
+# escape table for printed strings when sxprlib_enableEscape is off; same
+# output as json.dumps with the double backslashes collapsed again, done
+# in a single translate pass
+_STRING_TRANS_NOESC = {i: "\\u{:04x}".format(i) for i in range(0x20)}
+_STRING_TRANS_NOESC.update(
+    {
+        ord('"'): '\\"',
+        0x08: "\\b",
+        0x09: "\\t",
+        0x0A: "\\n",
+        0x0C: "\\f",
+        0x0D: "\\r",
+    }
+)
 
 
 # ---------------------- data type definition
@@ -171,34 +219,42 @@ NIL = Nil()
 class Cons:
     """Definition of Cons data type"""
 
+    __slots__ = ("car", "cdr")
+
     def __init__(self, car=_NIL, cdr=_NIL):
         self.car = car
         self.cdr = cdr
 
     def __str__(self):
-        l = []
-        s = Cons.__Sxpr2Str(self, l)
-        l.clear()
-        del l
-        return s
+        return Cons.__Sxpr2Str(self, set())
 
     def __repr__(self):
-        l = dict()
-        s = Cons.__Sxpr2Repr(self, l)
-        l.clear()
-        del l
-        return s
+        out = []
+        Cons.__Sxpr2Repr(self, dict(), out)
+        return "".join(out)
 
     def __len__(self):
+        # tight loop without the cycle-detection set; acyclic lists (the
+        # overwhelmingly common case) never pay for hashing every node
         n = 1
         c = self
-        occurence = {id(c)}
-        while type(c.cdr) is Cons and not id(c.cdr) in occurence:
+        C = Cons
+        cdr = c.cdr
+        while cdr.__class__ is C:
             n = n + 1
-            occurence.add(id(c.cdr))
-            c = c.cdr
-        occurence.clear()
-        del occurence
+            c = cdr
+            cdr = c.cdr
+            if n > 10000:
+                # long enough that a cycle is plausible; rewalk with the
+                # id set, which terminates on the first revisit
+                n = 1
+                c = self
+                occurence = {id(c)}
+                while type(c.cdr) is Cons and not id(c.cdr) in occurence:
+                    n = n + 1
+                    occurence.add(id(c.cdr))
+                    c = c.cdr
+                return n
         return n
 
     def __getitem__(self, n):
@@ -208,12 +264,16 @@ class Cons:
             raise IndexError("Cons: index out of range")
         m = n
         c = self
-        while m > 0:
-            if not type(c) in {Cons, Nil}:
-                raise IndexError("Cons: index out of range")
+        C = Cons
+        while m > 0 and c.__class__ is C:
             c = c.cdr
             m = m - 1
-        if type(c) is not Cons:
+        if m > 0:
+            # walked off the spine; only NIL absorbs the remaining steps
+            if c.__class__ is not Nil:
+                raise IndexError("Cons: index out of range")
+            return _NIL
+        if c.__class__ is not C:
             return c
         else:
             return c.car
@@ -226,13 +286,14 @@ class Cons:
         m = n
         c = self
         p = _NIL
-        while m > 0:
-            if type(c) is not Cons:
-                raise IndexError("Cons: index out of range")
+        C = Cons
+        while m > 0 and c.__class__ is C:
             p = c
             c = c.cdr
             m = m - 1
-        if type(c) is not Cons:
+        if m > 0:
+            raise IndexError("Cons: index out of range")
+        if c.__class__ is not C:
             p.cdr = x
         else:
             c.car = x
@@ -247,106 +308,166 @@ class Cons:
             super().__delattr__(name)
 
     def __eq__(self, v):
-        if type(v) is Cons:
-            return repr(self) == repr(v)
-        return False
+        # structural pair-walk; short-circuits on the first mismatch
+        # instead of building two full repr strings
+        if type(v) is not Cons:
+            return False
+        C = Cons
+        stack = [(self, v)]
+        pop = stack.pop
+        push = stack.append
+        steps = 0
+        seen = None
+        while stack:
+            a, b = pop()
+            while a.__class__ is C and b.__class__ is C:
+                if a is b:
+                    break
+                if seen is None:
+                    steps = steps + 1
+                    if steps > 10000:
+                        # long enough that a cycle is plausible; track
+                        # visited pairs so the walk terminates
+                        seen = set()
+                else:
+                    key = (id(a), id(b))
+                    if key in seen:
+                        break
+                    seen.add(key)
+                push((a.car, b.car))
+                a = a.cdr
+                b = b.cdr
+            else:
+                if a.__class__ is C or b.__class__ is C:
+                    return False
+                if a != b:
+                    return False
+        return True
 
     def __ne__(self, v):
-        if type(v) is Cons:
-            return repr(self) != repr(v)
-        return True
+        return not self.__eq__(v)
 
-    @staticmethod
-    def __Sxpr2Str(ex, occurence):
-        if type(ex) is Cons:
-            if sxprlib_enableQuote and ex.car == Symbol("quote") and consp(ex.cdr):
-                if null(ex.cdr.cdr):
-                    return "'{}".format(Cons.__Sxpr2Str(ex.cdr.car, occurence))
-            if sxprlib_enableFuncRef and ex.car == Symbol("function") and consp(ex.cdr):
-                if null(ex.cdr.cdr) and symbolp(ex.cdr.car):
-                    return "#'{}".format(Cons.__Sxpr2Str(ex.cdr.car, occurence))
-            return "({})".format(Cons.__Cons2SeqStr(ex, occurence))
-        return str(ex)
+    # work-stack opcodes shared by the iterative serializers below
+    _OP_OBJ = 0  # serialize one object (with quote/funcref sugar)
+    _OP_SPINE = 1  # serialize the next node of a list spine
+    _OP_TEXT = 2  # emit a literal fragment
+    _OP_CLOSE = 3  # discard the spine ids and emit ")"
 
     @staticmethod
-    def __Cons2SeqStr(c, occurence):
-        localoccurence = set()
-        occurence.append(localoccurence)
-        s = []
-        while True:
-            if type(c) is not Cons:
-                oc = []
-                oc.extend(occurence)
-                s.extend([". ", Cons.__Sxpr2Str(c, oc)])
-                oc.clear()
-                break
-            if _inany(id(c), occurence):
-                s.append("...")
-                break
-            localoccurence.add(id(c))
-            oc = []
-            oc.extend(occurence)
-            s.append(Cons.__Sxpr2Str(c.car, oc))
-            oc.clear()
-            c = c.cdr
-            if type(c) is Nil:
-                break
-            s.append(" ")
-        localoccurence.clear()
-        return "".join(s)
+    def __Sxpr2Str(ex, visited):
+        # explicit work stack instead of mutual recursion; a deeply nested
+        # EDIF tree no longer needs sys.setrecursionlimit, and each node
+        # costs a couple of tuple pushes instead of a Python frame
+        OBJ = Cons._OP_OBJ
+        SPINE = Cons._OP_SPINE
+        TEXT = Cons._OP_TEXT
+        CLOSE = Cons._OP_CLOSE
+        out = []
+        emit = out.append
+        stack = [(OBJ, ex)]
+        push = stack.append
+        pop = stack.pop
+        while stack:
+            op, x = pop()
+            if op == OBJ:
+                while True:
+                    if type(x) is not Cons:
+                        emit(str(x))
+                        break
+                    car = x.car
+                    if (
+                        sxprlib_enableQuote
+                        and car is _SYM_QUOTE
+                        and consp(x.cdr)
+                        and null(x.cdr.cdr)
+                    ):
+                        emit("'")
+                        x = x.cdr.car
+                        continue
+                    if (
+                        sxprlib_enableFuncRef
+                        and car is _SYM_FUNCTION
+                        and consp(x.cdr)
+                        and null(x.cdr.cdr)
+                        and symbolp(x.cdr.car)
+                    ):
+                        emit("#'")
+                        x = x.cdr.car
+                        continue
+                    emit("(")
+                    local = []
+                    push((CLOSE, local))
+                    push((SPINE, (x, local)))
+                    break
+            elif op == TEXT:
+                emit(x)
+            elif op == SPINE:
+                c, local = x
+                if type(c) is not Cons:
+                    emit(". ")
+                    push((OBJ, c))
+                elif id(c) in visited:
+                    emit("...")
+                else:
+                    visited.add(id(c))
+                    local.append(id(c))
+                    rest = c.cdr
+                    if type(rest) is not Nil:
+                        push((SPINE, (rest, local)))
+                        push((TEXT, " "))
+                    push((OBJ, c.car))
+            else:  # CLOSE
+                for i in x:
+                    visited.discard(i)
+                emit(")")
+        return "".join(out)
 
     @staticmethod
-    def __Sxpr2Repr(s, occurence):
+    def __Sxpr2Repr(s, occurence, out):
+        # appends fragments to the shared out list; the single join
+        # happens once in __repr__ instead of at every nesting level
         if s is _NIL:
-            return "NIL"
+            out.append("NIL")
+            return
         elif type(s) is not Cons:
-            return repr(s)
-        sbeg = []
-        send = []
+            out.append(repr(s))
+            return
+        nclose = 0
         while True:
             if type(s) is Array:
-                sbeg.extend(
-                    [
-                        "Array(",
-                        str(s.dim),
-                        ", ",
-                        Cons.__Sxpr2Repr(s.value, occurence),
-                        ")",
-                    ]
-                )
+                out.extend(["Array(", str(s.dim), ", "])
+                Cons.__Sxpr2Repr(s.value, occurence, out)
+                out.append(")")
                 break
             elif type(s) is not Cons:
-                sbeg.append(repr(s))
+                out.append(repr(s))
                 break
             if id(s) in occurence:
-                sbeg.extend(["<Cons at #", str(occurence[id(s)]), ">"])
+                out.extend(["<Cons at #", str(occurence[id(s)]), ">"])
                 break
             occurence[id(s)] = len(occurence)
             if type(s.car) is Array:
-                sbeg.extend(
-                    [
-                        "Cons(Array(",
-                        str(s.car.dim),
-                        ", ",
-                        Cons.__Sxpr2Repr(s.car.value, occurence),
-                        "), ",
-                    ]
-                )
-                send.append(")")
+                out.extend(["Cons(Array(", str(s.car.dim), ", "])
+                Cons.__Sxpr2Repr(s.car.value, occurence, out)
+                out.append("), ")
             else:
-                sbeg.extend(["Cons(", Cons.__Sxpr2Repr(s.car, occurence), ", "])
-                send.append(")")
+                out.append("Cons(")
+                Cons.__Sxpr2Repr(s.car, occurence, out)
+                out.append(", ")
+            nclose = nclose + 1
             s = s.cdr
-        sbeg.extend(send)
-        # del send
-        return "".join(sbeg)
+        out.append(")" * nclose)
 
 
 # data type: Char
 class Char:
     """Definition of Char data type"""
 
-    __CharInstance = _WVDic({})
+    __slots__ = ("value",)
+
+    # plain dict: interned chars stay alive for the process, which avoids
+    # a weakref wrapper and GC finalizer per instance
+    __CharInstance = {}
     __NameToCharDic = {
         "Backspace": "\x08",
         "Escape": "\x1b",
@@ -370,14 +491,23 @@ class Char:
     }
 
     def __new__(self, value="?"):
-        if type(value) is Char:
-            return value
-        elif type(value) is str:
+        cls = value.__class__
+        if cls is str:
             v = value
-        elif type(value) is String:
+        elif cls is Char:
+            return value
+        elif cls is String:
             v = value.value
         else:
             v = str(value)
+        if len(v) == 1:
+            # the common case: already a bare character, nothing to decode
+            obj = Char.__CharInstance.get(v)
+            if obj is None:
+                obj = super().__new__(self)
+                obj.value = v
+                Char.__CharInstance[v] = obj
+            return obj
         if not Char.IsChar(v):
             raise ValueError('Char(): Illegal argument "{}"!'.format(v))
         if _is_charhex(v):  # "#\\[uxUX][0-9a-fA-F]+"
@@ -396,31 +526,22 @@ class Char:
         v = self.value
         c = ord(v)
         if c <= 32 or (127 <= c and c <= 255):
-            v = "#\\{}".format(Char.__CharToNameDic.get(v, "x{:02x}".format(c)))
-        else:
-            v = _dumps(v, ensure_ascii=False)
-            v = "#\\" + v[1:][:-1]
-            v = v.replace("\\\\", "\\")
-            if len(v) >= 12:
-                v = "#\\U{:08x}".format(c)
-        return v
+            return "#\\{}".format(Char.__CharToNameDic.get(v, "x{:02x}".format(c)))
+        return "#\\" + v
 
     def __repr__(self):
         v = self.value
         c = ord(v)
         if c <= 32 or (127 <= c and c <= 255):
-            v = '"{}"'.format(Char.__CharToNameDic.get(v, "\\x{:02x}".format(c)))
-        else:
-            v = _dumps(v, ensure_ascii=False)
-            if len(v) >= 14:
-                v = '"\\U{:08x}"'.format(c)
-        return "Char({})".format(v)
+            v = Char.__CharToNameDic.get(v, "\\x{:02x}".format(c))
+        elif v == '"' or v == "\\":
+            v = "\\" + v
+        return 'Char("{}")'.format(v)
 
     def __setattr__(self, name, value):
-        if name == "value" and name in self.__dict__:  # avoid overriding 'value'
+        if name == "value" and hasattr(self, name):  # avoid overriding 'value'
             raise PermissionError("Char: {} is read only!".format(name))
-        # super().__setattr__(name, value)
-        self.__dict__[name] = value
+        object.__setattr__(self, name, value)
 
     def __delattr__(self, name):
         if name == "value":
@@ -429,17 +550,22 @@ class Char:
             super().__delattr__(name)
 
     def __hash__(self):
-        return hash(("SxprLib Char", self.value))
+        # chars are interned, so identity stands in for the value
+        return id(self)
 
     def __eq__(self, v):
-        if type(v) in {Char, String}:
+        if type(v) is Char:
+            return v is self
+        elif type(v) is String:
             return v.value == self.value
         elif type(v) is str:
             return v == self.value
         return False
 
     def __ne__(self, v):
-        if type(v) in {Char, String}:
+        if type(v) is Char:
+            return v is not self
+        elif type(v) is String:
             return v.value != self.value
         elif type(v) is str:
             return v != self.value
@@ -449,10 +575,16 @@ class Char:
     def listall():
         return [x for x in Char.__CharInstance]
 
+    @staticmethod
+    def clear_cache():
+        Char.__CharInstance.clear()
+
     @staticmethod
     def IsChar(s):
         if type(s) is not str:
             return False
+        if len(s) == 1:
+            return True
         if _is_charhex(s):  # "#\\[uxUX][0-9a-fA-F]+"
             x = int(s[3:], 16)
             if 0 <= x and x <= 0x10FFFF:
@@ -471,14 +603,19 @@ class Char:
 class Symbol:
     """Definition of Symbol data type"""
 
-    __SymbolInstance = _WVDic({})
+    __slots__ = ("value",)
+
+    # plain dict: interned symbols stay alive for the process, which
+    # avoids a weakref wrapper and GC finalizer per instance
+    __SymbolInstance = {}
 
     def __new__(self, value="?"):
-        if type(value) is Symbol:
-            return value
-        elif type(value) is str:
+        cls = value.__class__
+        if cls is str:
             v = value
-        elif type(value) is String:
+        elif cls is Symbol:
+            return value
+        elif cls is String:
             v = value.value
         else:
             v = str(value)
@@ -497,33 +634,11 @@ class Symbol:
         if self.value == ".":
             return "\\."
         else:
-            s = str(self.value).translate(
-                str.maketrans(
-                    {
-                        "(": "\\(",
-                        ")": "\\)",
-                        " ": "_",
-                        "|": "\\|",
-                        '"': '\\"',
-                        "\a": "\\a",
-                        "\b": "\\b",
-                        "\f": "\\f",
-                        "\n": "\\n",
-                        "\r": "\\r",
-                        "\t": "\\t",
-                        "\v": "\\v",
-                    }
-                )
-            )
-            if (
-                (sxprlib_enableDec and _is_integer(s))
-                or (sxprlib_enableBin and _is_bin(s))
-                or (sxprlib_enableOct and _is_oct(s))
-                or (sxprlib_enableHex and _is_hex(s))
-                or (sxprlib_enableRadix and _is_radix(s))
-                or (sxprlib_enableFrac and _is_fraction(s))
-                or (sxprlib_enableFloat and _is_number(s) and not _is_integer(s))
-            ):
+            s = self.value
+            if _symbol_needs_escape(s) is not None:
+                s = s.translate(_SYMBOL_TRANS)
+            m = _classify_number(s)
+            if m is not None and m.lastgroup in _active_number_groups():
                 s = "|{}|".format(s)
             return "{}".format(s)
 
@@ -531,10 +646,9 @@ class Symbol:
         return "Symbol({})".format(repr(self.value))
 
     def __setattr__(self, name, value):
-        if name == "value" and name in self.__dict__:  # avoid overriding 'value'
+        if name == "value" and hasattr(self, name):  # avoid overriding 'value'
             raise PermissionError("Symbol: {} is read only!".format(name))
-        # super().__setattr__(name, value)
-        self.__dict__[name] = value
+        object.__setattr__(self, name, value)
 
     def __delattr__(self, name):
         if name == "value":
@@ -543,49 +657,57 @@ class Symbol:
             super().__delattr__(name)
 
     def __hash__(self):
-        return hash(("SxprLib Symbol", self.value))
+        # symbols are interned, so identity stands in for the value
+        return id(self)
 
     def __eq__(self, v):
-        if type(v) is Symbol:
-            return self.value == v.value
-        return False
+        return self is v
 
     def __ne__(self, v):
-        if type(v) is Symbol:
-            return self.value != v.value
-        return True
+        return self is not v
 
     @staticmethod
     def listall():
         return [x for x in Symbol.__SymbolInstance]
 
+    @staticmethod
+    def clear_cache():
+        Symbol.__SymbolInstance.clear()
+
+
+# interned once at import; the serializers compare these with 'is' instead
+# of paying an intern-table lookup per node
+_SYM_QUOTE = Symbol("quote")
+_SYM_FUNCTION = Symbol("function")
+
 
 # data type: String
 class String:
     """Definition of String data type"""
 
+    __slots__ = ("value",)
+
     def __init__(self, value=""):
-        if type(value) is str:
+        cls = value.__class__
+        if cls is str:
             self.value = value
-        elif type(value) in {Symbol, String}:
+        elif cls is Symbol or cls is String:
             self.value = value.value
         else:
             self.value = str(value)
 
     def __str__(self):
-        s = _dumps(self.value, ensure_ascii=False)
         if not sxprlib_enableEscape:
-            s = s.replace("\\\\", "\\")
-        return s
+            return '"' + self.value.translate(_STRING_TRANS_NOESC) + '"'
+        return _dumps(self.value, ensure_ascii=False)
 
     def __repr__(self):
         return "String({})".format(repr(self.value))
 
     def __setattr__(self, name, value):
-        if name == "value" and name in self.__dict__:  # avoid overriding 'value'
+        if name == "value" and hasattr(self, name):  # avoid overriding 'value'
             raise PermissionError("String: {} is read only!".format(name))
-        # super().__setattr__(name, value)
-        self.__dict__[name] = value
+        object.__setattr__(self, name, value)
 
     def __delattr__(self, name):
         if name == "value":
@@ -628,11 +750,16 @@ Complex.str_format_spec = "#C({0} {1})"
 class Array:
     """Definition of Array data type"""
 
+    __slots__ = ("dim", "value")
+
     def __init__(self, dim, value=_NIL):
         self.dim = int(dim)
-        if listp(value):
+        # the parser always hands over a finished Cons tree, so test for
+        # that first
+        cls = value.__class__
+        if cls is Cons or value is _NIL:
             self.value = value
-        elif type(value) in {list, tuple}:
+        elif cls is list or cls is tuple:
             self.value = py2sx(value, False)
         else:
             self.value = py2sx(list(value), False)
@@ -650,15 +777,16 @@ class Array:
         if name == "dim":
             v = int(value)
         elif name == "value":
-            if listp(value):
+            cls = value.__class__
+            if cls is Cons or value is _NIL:
                 v = value
-            elif type(value) in {list, tuple}:
+            elif cls is list or cls is tuple:
                 v = py2sx(value, False)
             else:
                 v = py2sx(list(value), False)
         else:
             v = value
-        self.__dict__[name] = v
+        object.__setattr__(self, name, v)
 
     def __delattr__(self, name):
         if name in {"dim", "value"}:
@@ -674,22 +802,29 @@ class Array:
 class _ConsIterator:
     """Cons iterator object"""
 
+    __slots__ = ("__cons", "__occurence")
+
     def __init__(self, cons):
         self.__cons = cons
         self.__occurence = set()
 
     def __next__(self):
-        if type(self.__cons) is Nil or id(self.__cons) in self.__occurence:
-            self.__occurence.clear()
+        # the iterator protocol is the hot loop of every 'for v in cons';
+        # load the current cell once and branch on its class directly
+        c = self.__cons
+        cls = c.__class__
+        if cls is Cons:
+            i = id(c)
+            occurence = self.__occurence
+            if i in occurence:
+                raise StopIteration()
+            occurence.add(i)
+            self.__cons = c.cdr
+            return c.car
+        if cls is Nil:
             raise StopIteration()
-        if type(self.__cons) is Cons:
-            value = self.__cons.car
-            self.__occurence.add(id(self.__cons))
-            self.__cons = self.__cons.cdr
-        else:
-            value = self.__cons
-            self.__cons = _NIL
-        return value
+        self.__cons = _NIL
+        return c
 
 
 # ------------------------- Standard Lisp function
@@ -713,8 +848,9 @@ def mkcons(a, d):
 def mklist(*args):
     """make S-expression List (chained Cons) object"""
     r = _NIL
-    for v in args[::-1]:
-        r = Cons(v, r)
+    C = Cons
+    for i in range(len(args) - 1, -1, -1):
+        r = C(args[i], r)
     return r
 
 
@@ -728,6 +864,29 @@ def null(s):
     return s is _NIL
 
 
+# type tuples for the predicates and converters below; a module-level
+# tuple keeps the per-call set-literal construction out of the hot path
+# (a tuple rather than isinstance so that subclasses such as bool keep
+# their existing handling)
+_STRING_TYPES = (String, str)
+_RATIONAL_TYPES = (int, Fraction)
+_COMPLEX_TYPES = (complex, Complex)
+_REAL_TYPES = (int, float, Fraction)
+_NUMBER_TYPES = (int, float, Fraction, complex, Complex)
+_PASSTHROUGH_TYPES = (
+    int,
+    float,
+    Fraction,
+    Nil,
+    Cons,
+    Char,
+    Symbol,
+    String,
+    Complex,
+    Array,
+)
+
+
 def listp(s):
     """check if argument is Nil or Cons type"""
     return (s is _NIL) or (type(s) is Cons)
@@ -740,7 +899,7 @@ def symbolp(s):
 
 def stringp(s):
     """check if argument is String or str type"""
-    return type(s) in {String, str}
+    return type(s) in _STRING_TYPES
 
 
 def characterp(s):
@@ -760,22 +919,22 @@ def floatp(s):
 
 def rationalp(s):
     """check if argument is int or Fraction type"""
-    return type(s) in {int, Fraction}
+    return type(s) in _RATIONAL_TYPES
 
 
 def complexp(s):
     """check if argument is built-in complex or Complex type"""
-    return type(s) in {complex, Complex}
+    return type(s) in _COMPLEX_TYPES
 
 
 def realp(s):
     """check if argument is int or float or Fraction type"""
-    return type(s) in {int, float, Fraction}
+    return type(s) in _REAL_TYPES
 
 
 def numberp(s):
     """check if argument is int or float or Fraction or complex or Complex type"""
-    return type(s) in {int, float, Fraction, complex, Complex}
+    return type(s) in _NUMBER_TYPES
 
 
 def atom(s):
@@ -801,13 +960,26 @@ def mkreverse(l):
         raise TypeError(
             "mkreverse(): Not a valid S-expression List! {}".format(repr(l))
         )
-    n = len(l)
+    # single pass; the upfront len() walked the whole list a second time.
+    # Past 10000 nodes a cycle is plausible, so rewalk bounded by the
+    # cycle-aware length.
     r = _NIL
-    for v in l:
-        if n < 1:
+    C = Cons
+    c = l
+    n = 0
+    while c.__class__ is C:
+        r = C(c.car, r)
+        c = c.cdr
+        n = n + 1
+        if n > 10000:
+            m = len(l)
+            r = _NIL
+            c = l
+            while m > 0:
+                r = C(c.car, r)
+                c = c.cdr
+                m = m - 1
             break
-        r = Cons(v, r)
-        n = n - 1
     return r
 
 
@@ -816,15 +988,25 @@ def mkappend(l1, l2):
     if null(l1):
         return l2
     elif consp(l1):
-        n = len(l1) - 1
-        ret = Cons(l1.car)
+        C = Cons
+        ret = C(l1.car)
         c = ret
         l = l1.cdr
-        while n > 0:
-            c.cdr = Cons(l.car)
+        n = 0
+        while l.__class__ is C:
+            c.cdr = C(l.car)
             c = c.cdr
             l = l.cdr
-            n = n - 1
+            n = n + 1
+            if n > 10000:
+                # plausible cycle: finish bounded by the remaining length
+                m = len(l1) - 1 - n
+                while m > 0:
+                    c.cdr = C(l.car)
+                    c = c.cdr
+                    l = l.cdr
+                    m = m - 1
+                break
         c.cdr = l2
         return ret
     else:
@@ -836,11 +1018,21 @@ def nconc(l1, l2):  # destructive append
     if null(l1):
         return l2
     elif consp(l1):
-        n = len(l1) - 1
+        C = Cons
         ret = l1
-        while n > 0:
-            l1 = l1.cdr
-            n = n - 1
+        n = 0
+        nxt = l1.cdr
+        while nxt.__class__ is C:
+            l1 = nxt
+            nxt = l1.cdr
+            n = n + 1
+            if n > 10000:
+                # plausible cycle: finish bounded by the remaining length
+                m = len(ret) - 1 - n
+                while m > 0:
+                    l1 = l1.cdr
+                    m = m - 1
+                break
         l1.cdr = l2
         return ret
     else:
@@ -851,13 +1043,23 @@ def member(s, l):
     """search S-expression List for item"""
     if not consp(l):
         return _NIL
-    n = len(l)
-    while not (s == l.car):
+    C = Cons
+    n = 0
+    while l.__class__ is C:
+        if s == l.car:
+            return l
         l = l.cdr
-        n = n - 1
-        if n < 1:
-            return _NIL
-    return l
+        n = n + 1
+        if n > 10000:
+            # plausible cycle: finish bounded by the cycle-aware length
+            m = len(l) if l.__class__ is C else 0
+            while m > 0:
+                if s == l.car:
+                    return l
+                l = l.cdr
+                m = m - 1
+            break
+    return _NIL
 
 
 # ------------------------- miscellaneous tools
@@ -866,367 +1068,417 @@ def member(s, l):
 # sx2py: convert S-expression object to Python object
 def sx2py(s, native=True):
     """convert S-expression object to Python object"""
-    occurence = set()
-    listdic = dict()
-    s = __sx2py(s, native, occurence, listdic)
-    listdic.clear()
-    occurence.clear()
-    return s
+    return __sx2py(s, native, set(), dict())
 
 
 def __sx2py(s, native, occurence, listdic):
-    if s is _NIL:
-        return []
-    elif native and (type(s) in {String, Symbol, Char}):
-        return s.value
-    elif type(s) is Cons:
-        # if (
-        #    sxprlib_enableQuote
-        #    and s.car == Symbol("quote")
-        #    and consp(s.cdr)
-        #    and null(s.cdr.cdr)
-        # ):
-        #    return __sx2py(s.cdr.car, native, occurence, listdic)
-        # if (
-        #    sxprlib_enableFuncRef
-        #    and s.car == Symbol("function")
-        #    and consp(s.cdr)
-        #    and null(s.cdr.cdr)
-        #    and symbolp(s.cdr.car)
-        # ):
-        #    return __sx2py(s.cdr.car, native, occurence, listdic)
-        if id(s) in listdic:
-            return listdic[id(s)]
-        else:
+    # iterative worklist of (destination list, index, node); each Cons
+    # spine appends placeholders and schedules its cars, so no Python
+    # frame is spent per element and depth is unbounded
+    C = Cons
+    F = Fraction
+    A = Array
+    X = Complex
+    root = [None]
+    stack = [(root, 0, s)]
+    push = stack.append
+    while stack:
+        dst, i, s = stack.pop()
+        while type(s) is A:
+            s = s.value
+        if s is _NIL:
+            dst[i] = []
+            continue
+        cls = s.__class__
+        if native and (cls is String or cls is Symbol or cls is Char):
+            dst[i] = s.value
+        elif cls is C:
+            l = listdic.get(id(s))
+            if l is not None:
+                dst[i] = l
+                continue
             l = []
             listdic[id(s)] = l
-            while type(s) is Cons:
+            dst[i] = l
+            append = l.append
+            j = 0
+            while type(s) is C:
                 if id(s) in occurence:
                     raise ValueError("sx2py(): unresolvable recursion found.")
                 occurence.add(id(s))
-                l.append(__sx2py(s.car, native, occurence, listdic))
+                append(None)
+                push((l, j, s.car))
+                j = j + 1
                 s = s.cdr
             if s is not _NIL:
-                l.append(__sx2py(s, native, occurence, listdic))
-            return l
-    elif type(s) is Fraction:
-        if s.denominator == 1:
-            return s.numerator
+                append(None)
+                push((l, j, s))
+        elif cls is F:
+            if s.denominator == 1:
+                dst[i] = s.numerator
+            else:
+                dst[i] = s
+        elif cls is X:
+            dst[i] = complex(s)
         else:
-            return s
-    elif type(s) is Complex:
-        return complex(s)
-    elif type(s) is Array:
-        return __sx2py(s.value, native, occurence, listdic)
-    else:
-        return s
+            dst[i] = s
+    return root[0]
 
 
 # py2sx: convert Python list/tuple to S-expression object
 def py2sx(l, strassym=True):
     """convert Python list/tuple to S-expression object"""
-    occurence = dict()
-    s = __py2sx(l, strassym, occurence)
-    occurence.clear()
-    return s
+    return __py2sx(l, strassym, dict())
 
 
 def __py2sx(l, strassym, occurence):
-    if type(l) in {list, tuple}:
-        if id(l) in occurence:
-            return occurence[id(l)]
-        else:
-            if l:
-                ret = Cons(__py2sx(l[0], strassym, occurence))
-                occurence[id(l)] = ret
-                s = ret
-                for i in l[1:]:
-                    s.cdr = Cons(__py2sx(i, strassym, occurence))
-                    s = s.cdr
-                s.cdr = _NIL
+    # iterative worklist of (cons cell, python value); the cell's car is
+    # filled in when the value is converted.  A list is registered in
+    # occurence before its elements are walked, so self references
+    # anywhere in the list resolve to the same head.
+    C = Cons
+    root = C()
+    stack = [(root, l)]
+    push = stack.append
+    while stack:
+        cell, v = stack.pop()
+        cls = v.__class__
+        if cls is list or cls is tuple:
+            head = occurence.get(id(v))
+            if head is not None:
+                cell.car = head
+            elif v:
+                head = C()
+                occurence[id(v)] = head
+                cell.car = head
+                c = head
+                push((c, v[0]))
+                for k in range(1, len(v)):
+                    c.cdr = C()
+                    c = c.cdr
+                    push((c, v[k]))
+                c.cdr = _NIL
             else:
-                ret = _NIL
-            return ret
-    elif type(l) is str:
-        if strassym:
-            return Symbol(l)
+                cell.car = _NIL
+        elif cls is str:
+            if strassym:
+                cell.car = Symbol(v)
+            else:
+                cell.car = String(v)
+        elif cls is complex:
+            cell.car = Complex(v.real, v.imag)
+        elif cls in _PASSTHROUGH_TYPES:
+            cell.car = v
         else:
-            return String(l)
-    elif type(l) is complex:
-        return Complex(l.real, l.imag)
-    elif type(l) in {
-        int,
-        float,
-        Fraction,
-        Nil,
-        Cons,
-        Char,
-        Symbol,
-        String,
-        Complex,
-        Array,
-    }:
-        return l
-    else:
-        return String(str(l))
+            cell.car = String(str(v))
+    return root.car
 
 
 # sxpprint: simple pretty-print for S-expression data structure
 def sxpprint(s, file=__stdout):
     """simple pretty-print for S-expression"""
     out = file
-    occurence = []
-    __sxpprint_sub(s, 0, occurence, out)
+    __sxpprint_sub(s, 0, set(), out)
     out.write("\n")
-    occurence.clear()
-    del occurence
-
-
-def __sxpprint_sub(s, n, occurence, out):
-    localoccurence = set()
-    occurence.append(localoccurence)
-    quote = ""
-    while sxprlib_enableQuote and consp(s):
-        if s.car == Symbol("quote") and consp(s.cdr):
-            if null(s.cdr.cdr):
-                quote = quote + "'"
-                s = s.cdr.car
-                continue
-        break
-    if sxprlib_enableFuncRef and consp(s):
-        if s.car == Symbol("function") and consp(s.cdr):
-            if null(s.cdr.cdr) and symbolp(s.cdr.car):
-                quote = quote + "#'"
-                s = s.cdr.car
-    if consp(s) or arrayp(s):
-        if consp(s):
-            if n > 0:
-                out.write("\n" + " " * n + quote + "(")  # LF + Indent + '('
-            else:
-                out.write(quote + "(")  # '('
-        else:  #   arrayp(s)
-            if s.dim == 1:
-                dim = ""
-            else:
-                dim = "{}A".format(s.dim)
-            if n > 0:
-                out.write("\n" + " " * n + quote + "#{}(".format(dim))
+
+
+# work-stack opcodes for the iterative pretty-printer
+__PP_EXPR = 0  # print one expression at the given indent
+__PP_NEXT = 1  # print a spine node's element, then schedule __PP_CHECK
+__PP_TAIL = 2  # print a dotted tail
+__PP_CLOSE = 3  # discard the spine ids and emit ")"
+__PP_CHECK = 4  # cycle-check a spine node and advance to its successor
+
+
+def __sxpprint_sub(s, n, visited, out):
+    # explicit work stack instead of recursion; deeply nested data no
+    # longer needs sys.setrecursionlimit.  The visited id set is shared
+    # across the whole walk, pushed and popped per list spine.
+    stack = [(__PP_EXPR, s, n)]
+    push = stack.append
+    while stack:
+        frame = stack.pop()
+        op = frame[0]
+        if op == __PP_EXPR:
+            s = frame[1]
+            n = frame[2]
+            quote = ""
+            while sxprlib_enableQuote and consp(s):
+                if s.car is _SYM_QUOTE and consp(s.cdr):
+                    if null(s.cdr.cdr):
+                        quote = quote + "'"
+                        s = s.cdr.car
+                        continue
+                break
+            if sxprlib_enableFuncRef and consp(s):
+                if s.car is _SYM_FUNCTION and consp(s.cdr):
+                    if null(s.cdr.cdr) and symbolp(s.cdr.car):
+                        quote = quote + "#'"
+                        s = s.cdr.car
+            if consp(s) or arrayp(s):
+                if consp(s):
+                    if n > 0:
+                        out.write("\n" + " " * n + quote + "(")  # LF + Indent + '('
+                    else:
+                        out.write(quote + "(")  # '('
+                else:  #   arrayp(s)
+                    if s.dim == 1:
+                        dim = ""
+                    else:
+                        dim = "{}A".format(s.dim)
+                    if n > 0:
+                        out.write("\n" + " " * n + quote + "#{}(".format(dim))
+                    else:
+                        out.write(quote + "#{}(".format(dim))
+                    s = s.value
+                local = []
+                push((__PP_CLOSE, local))
+                if id(s) in visited:
+                    out.write("...")
+                    continue
+                visited.add(id(s))
+                local.append(id(s))
+                rest = s.cdr
+                if consp(rest):
+                    push((__PP_NEXT, rest, n, local))
+                elif not null(rest):
+                    push((__PP_TAIL, rest))
+                if consp(s.car):
+                    push((__PP_EXPR, s.car, n + 2))
+                else:
+                    out.write(str(s.car))
             else:
-                out.write(quote + "#{}(".format(dim))
-            s = s.value
-        if _inany(id(s), occurence):
-            out.write("...)")
-            localoccurence.clear()
-            return
-        localoccurence.add(id(s))
-        if consp(s.car):
-            occurence2 = []
-            occurence2.extend(occurence)
-            __sxpprint_sub(s.car, n + 2, occurence2, out)
-            occurence2.clear()
-        else:
-            out.write(str(s.car))
-        s = s.cdr
-        while consp(s):
-            occurence2 = []
-            occurence2.extend(occurence)
-            __sxpprint_sub(s.car, n + 2, occurence2, out)
-            occurence2.clear()
-            if _inany(id(s), occurence):
-                out.write(" ...)")
-                localoccurence.clear()
-                return
-            localoccurence.add(id(s))
-            s = s.cdr
-        if null(s):
+                out.write(" " + quote + str(s))
+        elif op == __PP_NEXT:
+            # the element is printed before its spine node is cycle-checked,
+            # mirroring the order of the old recursive loop
+            c = frame[1]
+            n = frame[2]
+            local = frame[3]
+            push((__PP_CHECK, c, n, local))
+            push((__PP_EXPR, c.car, n + 2))
+        elif op == __PP_TAIL:
+            out.write(" . " + str(frame[1]))
+        elif op == __PP_CLOSE:
+            for i in frame[1]:
+                visited.discard(i)
             out.write(")")
-        else:
-            out.write(" . " + str(s) + ")")
-    else:
-        out.write(" " + quote + str(s))
-    localoccurence.clear()
+        else:  # __PP_CHECK
+            c = frame[1]
+            n = frame[2]
+            local = frame[3]
+            if id(c) in visited:
+                # stop the spine here; its pending CLOSE still pops the
+                # ids and emits the ")"
+                out.write(" ...")
+                continue
+            visited.add(id(c))
+            local.append(id(c))
+            rest = c.cdr
+            if consp(rest):
+                push((__PP_NEXT, rest, n, local))
+            elif not null(rest):
+                push((__PP_TAIL, rest))
 
 
 # ------------------------------- S-expression Tokenizer
 
 
 # define token type (LPar, RPar, Dot, Quote, Complex)
-class __TokenType:
-    def __init__(self, value):
-        self.value = value
-
-    def __str__(self):
-        return "{}".format(str(self.value))
-
-
-__LPar = __TokenType("(")
-__RPar = __TokenType(")")
-__Dot = __TokenType(".")
-__Quote = __TokenType("'")
-__FuncRef = __TokenType("#'")
-__Complex = __TokenType("#C")
-_Undef = __TokenType("<undef>")
+# the parser only ever compares token markers with "is", so bare
+# unique objects are enough; their display names are looked up in
+# _TOKEN_NAMES only when an error message needs them
+__LPar = object()
+__RPar = object()
+__Dot = object()
+__Quote = object()
+__FuncRef = object()
+__Complex = object()
+_Undef = object()
+
+# parser frame opcodes (see _sxpr_read_obj)
+__F_LIST = 0
+__F_QUOTE = 1
+__F_ARRAY = 2
+
+_TOKEN_NAMES = {
+    __LPar: "(",
+    __RPar: ")",
+    __Dot: ".",
+    __Quote: "'",
+    __FuncRef: "#'",
+    __Complex: "#C",
+    _Undef: "<undef>",
+}
+
+
+_WHITESPACES = frozenset(" \t\r\n")
+_DELIMITERS = frozenset(' \t\r\n()"')
+
+# character-run patterns for streamers that can scan their source in
+# bulk (see SxprStreamerBaseClass._scan); each matches a maximal run
+# that the tokenizer would otherwise consume one read() at a time
+_WS_RUN = __compile(r'[ \t\r\n]+').match
+_ATOM_RUN = __compile(r'[^ \t\r\n()"]+').match
+_LINE_COMMENT_RUN = __compile(r"[^\r\n]+").match
+_BLOCK_COMMENT_RUN = __compile(r"[^|]+").match
+_STRING_RUN = __compile(r'[^"\\]+').match
+_STRING_RUN_NOESC = __compile(r'[^"]+').match
+
+# simple C-style escapes in string literals; octal/hex/unicode digit
+# escapes are decoded by the branches in the tokenizer
+_SIMPLE_ESC = {
+    "a": "\x07",  # BEL
+    "b": "\x08",  # BS
+    "e": "\x1b",  # ESC
+    "f": "\x0c",  # FF
+    "n": "\n",  # LF
+    "r": "\r",  # CR
+    "t": "\t",  # TAB
+    "v": "\x0b",  # VTAB
+}
+_OCT_DIGITS = frozenset("01234567")
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+# digit runs for decoding escapes out of a complete literal body
+_OCT_ESC_RUN = __compile(r"[0-7]{1,3}").match
+_OCT_ESC_RUN2 = __compile(r"[0-7]{1,2}").match  # first digit already in hand
+_HEX_ESC_RUN2 = __compile(r"[0-9a-fA-F]{1,2}").match
+_HEX_ESC_RUN4 = __compile(r"[0-9a-fA-F]{1,4}").match
+_HEX_ESC_RUN8 = __compile(r"[0-9a-fA-F]{1,8}").match
+
+
+def _string_unescape(text):
+    # decode the backslash escapes of a complete string-literal body;
+    # the semantics mirror the per-character branches of the tokenizer
+    parts = []
+    i = 0
+    find = text.find
+    while True:
+        j = find("\\", i)
+        if j < 0:
+            parts.append(text[i:])
+            return "".join(parts)
+        parts.append(text[i:j])
+        d = text[j + 1]
+        j = j + 2
+        if d in _OCT_DIGITS:
+            m = _OCT_ESC_RUN(text, j - 1)
+            parts.append("{:c}".format(int(m.group(), 8)))
+            i = m.end()
+            continue
+        if d == "x" or d == "X":
+            m = _HEX_ESC_RUN2(text, j)
+        elif d == "u":
+            m = _HEX_ESC_RUN4(text, j)
+        elif d == "U":
+            m = _HEX_ESC_RUN8(text, j)
+        else:
+            m = None
+        if m is not None:
+            parts.append("{:c}".format(int(m.group(), 16)))
+            i = m.end()
+        else:
+            parts.append(_SIMPLE_ESC.get(d, d))
+            i = j
+
+
+# master pattern recognizing one whole token (with any leading
+# whitespace/comments) in a single engine pass, for streamers that
+# support _scan(); it deliberately fails to match the cases that need
+# streamer-level care (EOF, unterminated strings and block comments),
+# which then take the per-character path.  The shape of the token
+# grammar depends on the syntax switches, so the compiled pattern is
+# rebuilt lazily whenever they are found to have changed.
+_token_re_cache = (None, None)
+
+
+def _token_run():
+    global _token_re_cache
+    flags = (
+        sxprlib_enableLineComment,
+        sxprlib_enableBlockComment,
+        sxprlib_enableQuote,
+        sxprlib_enableFuncRef,
+        sxprlib_enableEscape,
+    )
+    memo_flags, matcher = _token_re_cache
+    if memo_flags != flags:
+        lc, bc, q, fr, esc = flags
+        skip = [r"[ \t\r\n]+"]
+        if lc:
+            # the trailing lookahead keeps the engine from backtracking
+            # into a comment and reporting part of it as an atom; a
+            # comment not (yet) followed by its newline simply fails
+            # the whole pattern and takes the per-character path
+            skip.append(r";[^\r\n]*(?=[\r\n])")
+        if bc:
+            skip.append(r"#\|(?s:.*?)\|#")
+        alt = [r"(?P<lpar>\()", r"(?P<rpar>\))"]
+        if esc:
+            alt.append(r'(?P<string>"(?s:(?:\\.|[^"\\])*)")')
+        else:
+            alt.append(r'(?P<string>"[^"]*")')
+        if q:
+            # a quote directly followed by whitespace is the symbol "'"
+            alt.append(r"(?P<qsym>'(?=[ \t\r\n]))")
+            alt.append(r"(?P<quote>')")
+        if fr:
+            # "#'" followed by a delimiter is the symbol "#'"
+            alt.append(r"(?P<fsym>#'(?=[ \t\r\n()\"]))")
+            alt.append(r"(?P<funcref>#')")
+        alt.append(r"(?P<dot>\.(?=[ \t\r\n()\"]))")
+        # an atom never starts where a comment does, so forbid those
+        # prefixes instead of letting backtracking resurrect them
+        guard = ""
+        if lc:
+            guard = r"(?!;)"
+        if bc:
+            guard = guard + r"(?!#\|)"
+        alt.append("(?P<atom>" + guard + r'[^ \t\r\n()"]+)')
+        matcher = __compile(
+            "(?:" + "|".join(skip) + ")*(?:" + "|".join(alt) + ")"
+        ).match
+        _token_re_cache = (flags, matcher)
+    return matcher
 
 
 # tokenizer
 def _next_token(streamer):
-    if streamer.lookahead_token is _Undef:
-        streamer.lookahead_token = _sxpr_tokenizer(streamer)
+    # return the pending lookahead token and refill the slot; the
+    # position snapshot marks the end of the returned token, which is
+    # what error messages report
     r = streamer.lookahead_token
-    streamer.col = streamer.lookahead_col
-    streamer.line = streamer.lookahead_line
-    if r is not None:
-        streamer.lookahead_token = _sxpr_tokenizer(streamer)
+    if r is _Undef:
+        r = _sxpr_tokenizer(streamer)
+    streamer._mark()
+    streamer.lookahead_token = _sxpr_tokenizer(streamer) if r is not None else None
     return r
 
 
-def _sxpr_tokenizer(streamer):
-    WHITESPACES = {" ", "\t", "\r", "\n"}
-    DELIMITERS = {"(", ")", '"'}.union(WHITESPACES)
-    d = streamer.read()
-    while d in WHITESPACES:
-        d = streamer.read()
-    if sxprlib_enableLineComment and d == ";":
-        while not d in {"\r", "\n", ""}:
-            d = streamer.read()
-        return _sxpr_tokenizer(streamer)
-    elif sxprlib_enableBlockComment and d == "#" and streamer.lookahead_char == "|":
-        _ = streamer.read()  # skip "|"
-        d = streamer.read()
-        while d != "|" or streamer.lookahead_char != "#":
-            d = streamer.read()
-            if d == "":
-                raise EOFError(
-                    "Unexpected EOF: line={}, col={}".format(
-                        streamer.line, streamer.col
-                    )
-                )
-        _ = streamer.read()  # skip "#"
-        return _sxpr_tokenizer(streamer)
-    if d == "":  #                                            #  Empty
-        return None
-    elif sxprlib_enableQuote and d == "'":  #                 #  Quote
-        if streamer.lookahead_char in WHITESPACES:
-            return Symbol(d)
-        else:
-            return __Quote
-    elif (
-        sxprlib_enableFuncRef and d == "#" and streamer.lookahead_char == "'"
-    ):  #  FuncRef
-        _ = streamer.read()  # skip "'"
-        if streamer.lookahead_char in DELIMITERS:
-            return Symbol("#'")
-        else:
-            return __FuncRef
-    elif d == "(":  #                                         #  L-Par
-        return __LPar
-    elif d == ")":  #                                         #  R-Par
-        return __RPar
-    elif d == "." and streamer.lookahead_char in DELIMITERS:  #  Dot
-        return __Dot
-    elif d == '"':  #                                         #  String
-        s = ""
-        while streamer.lookahead_char != "" and streamer.lookahead_char != '"':
-            d = streamer.read()
-            if sxprlib_enableEscape and d == "\\":
-                d = streamer.read()
-                if __is_oct_digit(d):
-                    digit = d
-                    for _ in (1, 2):
-                        if not __is_oct_digit(streamer.lookahead_char):
-                            break
-                        digit = digit + streamer.read()
-                    n = int(digit, 8)
-                    d = "{:c}".format(n)
-                elif d.lower() == "x" and __is_hex_digit(streamer.lookahead_char):
-                    digit = streamer.read()
-                    for _ in (1,):
-                        if not __is_hex_digit(streamer.lookahead_char):
-                            break
-                        digit = digit + streamer.read()
-                    n = int(digit, 16)
-                    d = "{:c}".format(n)
-                elif d == "u" and __is_hex_digit(streamer.lookahead_char):
-                    digit = streamer.read()
-                    for _ in (1, 2, 3):
-                        if not __is_hex_digit(streamer.lookahead_char):
-                            break
-                        digit = digit + streamer.read()
-                    n = int(digit, 16)
-                    d = "{:c}".format(n)
-                elif d == "U" and __is_hex_digit(streamer.lookahead_char):
-                    digit = streamer.read()
-                    for _ in (1, 2, 3, 4, 5, 6, 7):
-                        if not __is_hex_digit(streamer.lookahead_char):
-                            break
-                        digit = digit + streamer.read()
-                    n = int(digit, 16)
-                    d = "{:c}".format(n)
-                else:
-                    d = {
-                        "a": "\x07",  # BEL
-                        "b": "\x08",  # BS
-                        "e": "\x1b",  # ESC
-                        "f": "\x0c",  # FF
-                        "n": "\n",  # LF
-                        "r": "\r",  # CR
-                        "t": "\t",  # TAB
-                        "v": "\x0b",  # VTAB
-                    }.get(d, d)
-            s = s + d
-        if streamer.lookahead_char == "":
-            raise EOFError(
-                "Unexpected EOF: line={}, col={}".format(streamer.line, streamer.col)
-            )
-        _ = streamer.read()  #  skip a trailing '"' character
-        return String(s)
-    else:
-        s = d
-        while streamer.lookahead_char != "" and not (
-            streamer.lookahead_char in DELIMITERS
-        ):
-            d = streamer.read()
-            s = s + d
-        if _is_integer(s) and sxprlib_enableDec:
+def _atom_token(s, streamer):
+    # classify a complete atom; the streamer is consulted for the
+    # lookahead-dependent "#..." prefixes (arrays and complex numbers)
+    m = _classify_number(s)
+    if m is not None and m.lastgroup in _active_number_groups():
+        g = m.lastgroup
+        if g == "int":
             return int(s)
-        elif _is_number(s) and not _is_integer(s) and sxprlib_enableFloat:
-            return float(
-                s.lower().replace("d", "e").replace("f", "e").replace("s", "e")
-            )
-        elif _is_bin(s) and sxprlib_enableBin:
-            val = s.split("/")
-            ret = int(val[0].lower().replace("#b", ""), 2)
-            if len(val) == 2:
-                x = int(val[1], 2)
-                ret = Fraction(ret, x)
-                if ret.denominator == 1:
-                    ret = ret.numerator
-            return ret
-        elif _is_oct(s) and sxprlib_enableOct:
-            val = s.split("/")
-            ret = int(val[0].lower().replace("#o", ""), 8)
-            if len(val) == 2:
-                x = int(val[1], 8)
-                ret = Fraction(ret, x)
-                if ret.denominator == 1:
-                    ret = ret.numerator
-            return ret
-        elif _is_hex(s) and sxprlib_enableHex:
-            val = s.split("/")
-            ret = int(val[0].lower().replace("#x", ""), 16)
-            if len(val) == 2:
-                x = int(val[1], 16)
-                ret = Fraction(ret, x)
-                if ret.denominator == 1:
-                    ret = ret.numerator
-            return ret
-        elif _is_radix(s) and sxprlib_enableRadix:  #       -#BBrNNNN
-            sgnval = s.lower().split("#")  #            ['-', 'BBrNNNN']
+        elif g == "float":
+            return float(s.translate(_FLOAT_TRANS))
+        elif g == "frac":
+            d = Fraction(s)
+            if d.denominator == 1:
+                return d.numerator
+            else:
+                return d
+        elif g == "radix":  #                       -#BBrNNNN
+            sgnval = s.lower().split("#")  #        ['-', 'BBrNNNN']
             if sgnval[0] == "-":
                 sgn = -1
             else:
                 sgn = 1
-            valstr = sgnval[1].split("r", 1)  #         ['BB', 'NNNN']
+            valstr = sgnval[1].split("r", 1)  #     ['BB', 'NNNN']
             val = valstr[1].split("/")
             base = int(valstr[0], 10)
             try:
@@ -1239,40 +1491,255 @@ def _sxpr_tokenizer(streamer):
             except:
                 ret = Symbol(s)
             return ret
-        elif _is_fraction(s) and sxprlib_enableFrac:
-            d = Fraction(s)
-            if d.denominator == 1:
-                return d.numerator
+        else:  # bin, oct and hex share one decoder
+            # the classifier guarantees the shape [+-]?#Xdigits, so the
+            # "#X" prefix can be sliced off instead of rewritten
+            base = _NUMBER_BASES[g]
+            val = s.split("/")
+            head = val[0]
+            if head[0] == "-":
+                ret = -int(head[3:], base)
+            elif head[0] == "+":
+                ret = int(head[3:], base)
             else:
-                return d
-        # elif s.upper() == 'NIL':
-        #      return _NIL
-        elif s.startswith("#"):
-            if sxprlib_enableChar and s.startswith("#\\"):
-                if Char.IsChar(s):
-                    return Char(s)
-                else:
-                    return Symbol(s)
-            elif sxprlib_enableArray and s == "#" and streamer.lookahead_char == "(":
-                return Array(1)
-            while streamer.lookahead_char in WHITESPACES:
-                d = streamer.read()
-            if (
-                sxprlib_enableComplex
-                and s.upper() == "#C"
-                and streamer.lookahead_char == "("
-            ):
-                return __Complex
-            elif (
-                sxprlib_enableArray
-                and _is_arrayprefix(s)
-                and streamer.lookahead_char == "("
-            ):
-                n = int(s.upper().replace("#", "").replace("A", ""))
-                return Array(n)
-            return Symbol(str(s))
+                ret = int(head[2:], base)
+            if len(val) == 2:
+                x = int(val[1], base)
+                ret = Fraction(ret, x)
+                if ret.denominator == 1:
+                    ret = ret.numerator
+            return ret
+    # elif s.upper() == 'NIL':
+    #      return _NIL
+    if s.startswith("#"):
+        if sxprlib_enableChar and s.startswith("#\\"):
+            if Char.IsChar(s):
+                return Char(s)
+            else:
+                return Symbol(s)
+        elif sxprlib_enableArray and s == "#" and streamer.lookahead_char == "(":
+            return Array(1)
+        while streamer.lookahead_char in _WHITESPACES:
+            d = streamer.read()
+        if (
+            sxprlib_enableComplex
+            and s.upper() == "#C"
+            and streamer.lookahead_char == "("
+        ):
+            return __Complex
+        elif (
+            sxprlib_enableArray
+            and _is_arrayprefix(s)
+            and streamer.lookahead_char == "("
+        ):
+            return Array(int(s[1:-1]))  # "#<rank>A(" -> rank digits
+        return Symbol(s)
+    else:
+        return Symbol(s)
+
+
+def _tok_lpar(streamer, d):
+    return __LPar
+
+
+def _tok_rpar(streamer, d):
+    return __RPar
+
+
+def _tok_quote(streamer, d):
+    if not sxprlib_enableQuote:
+        return _tok_atom(streamer, d)
+    if streamer.lookahead_char in _WHITESPACES:
+        return Symbol(d)
+    else:
+        return __Quote
+
+
+def _tok_dot(streamer, d):
+    if streamer.lookahead_char in _DELIMITERS:
+        return __Dot
+    return _tok_atom(streamer, d)
+
+
+def _tok_semicolon(streamer, d):
+    if not sxprlib_enableLineComment:
+        return _tok_atom(streamer, d)
+    read = streamer.read
+    streamer._scan(_LINE_COMMENT_RUN)
+    while not d in {"\r", "\n", ""}:
+        d = read()
+    return _sxpr_tokenizer(streamer)
+
+
+def _tok_hash(streamer, d):
+    # "#" may open a block comment or a function reference before
+    # falling through to an ordinary atom
+    read = streamer.read
+    if sxprlib_enableBlockComment and streamer.lookahead_char == "|":
+        _ = read()  # skip "|"
+        streamer._scan(_BLOCK_COMMENT_RUN)
+        d = read()
+        while d != "|" or streamer.lookahead_char != "#":
+            streamer._scan(_BLOCK_COMMENT_RUN)
+            d = read()
+            if d == "":
+                line, col = streamer._mark_position()
+                raise EOFError(
+                    "Unexpected EOF: line={}, col={}".format(line, col)
+                )
+        _ = read()  # skip "#"
+        return _sxpr_tokenizer(streamer)
+    if sxprlib_enableFuncRef and streamer.lookahead_char == "'":
+        _ = read()  # skip "'"
+        if streamer.lookahead_char in _DELIMITERS:
+            return Symbol("#'")
         else:
-            return Symbol(str(s))
+            return __FuncRef
+    return _tok_atom(streamer, d)
+
+
+def _tok_string(streamer, d):
+    read = streamer.read
+    parts = []
+    # sample the escape switch once per string token; the per-iteration
+    # global lookups add up on long strings
+    esc = sxprlib_enableEscape
+    run = _STRING_RUN if esc else _STRING_RUN_NOESC
+    while streamer.lookahead_char != "" and streamer.lookahead_char != '"':
+        m = streamer._scan(run)
+        if m is not None:
+            parts.append(m.group())
+            continue
+        d = read()
+        if esc and d == "\\":
+            d = read()
+            if d in _OCT_DIGITS:
+                # grab the remaining digits in one scan where the
+                # streamer supports it; the read() loops below are the
+                # fallback (and the buffer-boundary case of the file
+                # streamer)
+                digit = d
+                m = streamer._scan(_OCT_ESC_RUN2)
+                if m is not None:
+                    digit = digit + m.group()
+                else:
+                    for _ in (1, 2):
+                        if streamer.lookahead_char not in _OCT_DIGITS:
+                            break
+                        digit = digit + read()
+                d = "{:c}".format(int(digit, 8))
+            elif (d == "x" or d == "X") and streamer.lookahead_char in _HEX_DIGITS:
+                m = streamer._scan(_HEX_ESC_RUN2)
+                if m is not None:
+                    digit = m.group()
+                else:
+                    digit = read()
+                    for _ in (1,):
+                        if streamer.lookahead_char not in _HEX_DIGITS:
+                            break
+                        digit = digit + read()
+                d = "{:c}".format(int(digit, 16))
+            elif d == "u" and streamer.lookahead_char in _HEX_DIGITS:
+                m = streamer._scan(_HEX_ESC_RUN4)
+                if m is not None:
+                    digit = m.group()
+                else:
+                    digit = read()
+                    for _ in (1, 2, 3):
+                        if streamer.lookahead_char not in _HEX_DIGITS:
+                            break
+                        digit = digit + read()
+                d = "{:c}".format(int(digit, 16))
+            elif d == "U" and streamer.lookahead_char in _HEX_DIGITS:
+                m = streamer._scan(_HEX_ESC_RUN8)
+                if m is not None:
+                    digit = m.group()
+                else:
+                    digit = read()
+                    for _ in (1, 2, 3, 4, 5, 6, 7):
+                        if streamer.lookahead_char not in _HEX_DIGITS:
+                            break
+                        digit = digit + read()
+                d = "{:c}".format(int(digit, 16))
+            else:
+                d = _SIMPLE_ESC.get(d, d)
+        parts.append(d)
+    if streamer.lookahead_char == "":
+        line, col = streamer._mark_position()
+        raise EOFError(
+            "Unexpected EOF: line={}, col={}".format(line, col)
+        )
+    _ = read()  #  skip a trailing '"' character
+    return String("".join(parts))
+
+
+def _tok_atom(streamer, d):
+    s = d
+    m = streamer._scan(_ATOM_RUN)
+    if m is not None:
+        s = s + m.group()
+    else:
+        read = streamer.read
+        la = streamer.lookahead_char
+        while la != "" and la not in _DELIMITERS:
+            s = s + read()
+            la = streamer.lookahead_char
+    return _atom_token(s, streamer)
+
+
+# first-character dispatch for the per-character path; the handlers
+# check the syntax switches themselves, so the table never needs
+# rebuilding when those change
+_TOKEN_DISPATCH = {
+    "(": _tok_lpar,
+    ")": _tok_rpar,
+    '"': _tok_string,
+    "'": _tok_quote,
+    "#": _tok_hash,
+    ";": _tok_semicolon,
+    ".": _tok_dot,
+}
+
+
+def _sxpr_tokenizer(streamer):
+    m = streamer._scan(_token_run())
+    if m is not None:
+        g = m.lastgroup
+        if g == "atom":
+            return _atom_token(m.group(g), streamer)
+        elif g == "lpar":
+            return __LPar
+        elif g == "rpar":
+            return __RPar
+        elif g == "string":
+            v = m.group(g)[1:-1]
+            if sxprlib_enableEscape and "\\" in v:
+                v = _string_unescape(v)
+            return String(v)
+        elif g == "quote":
+            return __Quote
+        elif g == "dot":
+            return __Dot
+        elif g == "funcref":
+            return __FuncRef
+        elif g == "qsym":
+            return Symbol("'")
+        else:  # fsym
+            return Symbol("#'")
+    # per-character path: streamers without bulk scanning, and the
+    # cases the master pattern leaves alone (EOF, unterminated strings
+    # and block comments)
+    read = streamer.read
+    streamer._scan(_WS_RUN)
+    d = read()
+    while d in _WHITESPACES:
+        d = read()
+    if d == "":  #                                            #  Empty
+        return None
+    h = _TOKEN_DISPATCH.get(d)
+    if h is not None:
+        return h(streamer, d)
+    return _tok_atom(streamer, d)
 
 
 # ------------------------------- S-expression Parser
@@ -1282,87 +1749,126 @@ def _sxpr_tokenizer(streamer):
 # CONSSEQ : CONSSEQ '.' SXPR ')' | CONSSEQ SXPR ')' ;
 
 
+__NoValue = object()  # "no value produced yet" marker for the parser loop
+
+# value-token classes fed directly to the surrounding structure
+_VALUE_TOKEN_TYPES = (int, float, Fraction, Symbol, String, Char)
+
+
 def _sxpr_read_obj(streamer):
     # ----------
     if streamer is None:
         return None
     # ----------
-    tkn = _next_token(streamer)
-    # ----------
-    if tkn is None:
-        return None
-    # ----------
-    if tkn is __Quote:
-        return Cons(Symbol("quote"), Cons(_sxpr_read_obj(streamer)))
-    elif tkn is __FuncRef:
-        return Cons(Symbol("function"), Cons(_sxpr_read_obj(streamer)))
-    elif type(tkn) in {int, float, Fraction, Symbol, String, Char}:
-        return tkn
-    elif tkn is __Complex:
-        tkn = _next_token(streamer)
-        if tkn is __LPar:
+    # explicit frame stack instead of recursing into a list reader, so
+    # nesting depth is bounded by memory rather than the interpreter
+    # recursion limit.  Frames:
+    #   [__F_LIST, elems, tail, state]  list under construction; state
+    #       0: reading elements, 1: the next value is the dotted tail,
+    #       2: tail read, only ")" may follow
+    #   (__F_QUOTE, symbol)             wrap the next value
+    #   (__F_ARRAY, array)              attach the next list
+    stack = []
+    while True:
+        v = __NoValue
+        if stack:
+            f = stack[-1]
+            if f[0] == __F_LIST:
+                la = streamer.lookahead_token
+                if f[3] == 2:
+                    if la is not __RPar:
+                        _ = _next_token(streamer)
+                        line, col = streamer._mark_position()
+                        raise SyntaxError(
+                            "')' is expected: line={}, col={}".format(line, col)
+                        )
+                elif la is None:
+                    _ = _next_token(streamer)  # Skip token to consist with error location
+                    line, col = streamer._mark_position()
+                    raise SyntaxError(
+                        "Unexpected EOF: line={}, col={}".format(line, col)
+                    )
+                elif la is __Dot and f[3] == 0 and f[1]:
+                    _ = _next_token(streamer)  # Skip DOT '.'
+                    f[3] = 1
+                    continue
+                if f[3] == 2 or (f[3] == 0 and la is __RPar):
+                    _ = _next_token(streamer)  # Skip ')'
+                    stack.pop()
+                    elems = f[1]
+                    v = f[2]
+                    for i in range(len(elems) - 1, -1, -1):
+                        v = Cons(elems[i], v)
+        if v is __NoValue:
             tkn = _next_token(streamer)
-            if realp(tkn):
-                re = tkn
+            if tkn is None:
+                if not stack:
+                    return None
+                v = None  # EOF behind quote prefixes, as before
+            elif type(tkn) in _VALUE_TOKEN_TYPES:
+                v = tkn
+            elif tkn is __LPar:
+                stack.append([__F_LIST, [], _NIL, 0])
+                continue
+            elif tkn is __Quote:
+                stack.append((__F_QUOTE, _SYM_QUOTE))
+                continue
+            elif tkn is __FuncRef:
+                stack.append((__F_QUOTE, _SYM_FUNCTION))
+                continue
+            elif tkn is __Complex:
                 tkn = _next_token(streamer)
-                if realp(tkn):
-                    im = tkn
-                    tkn = _next_token(streamer)
-                    if tkn is __RPar:
-                        return Complex(re, im)
-        raise SyntaxError(
-            "Invalid Complex expression: line={}, col={}".format(
-                streamer.line, streamer.col
-            )
-        )
-    elif type(tkn) is Array:
-        if streamer.lookahead_token is __LPar:
-            _ = _next_token(streamer)
-            tkn.value = _sxpr_read_list(streamer)
-            return tkn
-        _ = _next_token(streamer)
-        raise SyntaxError(
-            "Invalid Array expression: line={}, col={}".format(
-                streamer.line, streamer.col
-            )
-        )
-    elif tkn is __LPar:
-        return _sxpr_read_list(streamer)
-    raise SyntaxError(
-        "Unexpected token '{}': line={}, col={}".format(
-            tkn, streamer.line, streamer.col
-        )
-    )
-
-
-def _sxpr_read_list(streamer):
-    if streamer.lookahead_token is __RPar:
-        _ = _next_token(streamer)  # Skip ')'
-        return _NIL
-    ret = Cons(_sxpr_read_obj(streamer))
-    c = ret
-    # ---- CONSSEQ
-    while streamer.lookahead_token is not __RPar:
-        if streamer.lookahead_token is None:
-            _ = _next_token(streamer)  # Skip token to consist with error location
-            raise SyntaxError(
-                "Unexpected EOF: line={}, col={}".format(streamer.line, streamer.col)
-            )
-        if streamer.lookahead_token is __Dot:
-            _ = _next_token(streamer)  # Skip DOT '.'
-            c.cdr = _sxpr_read_obj(streamer)
-            if streamer.lookahead_token is not __RPar:
+                if tkn is __LPar:
+                    re = _next_token(streamer)
+                    if realp(re):
+                        im = _next_token(streamer)
+                        if realp(im) and _next_token(streamer) is __RPar:
+                            v = Complex(re, im)
+                if v is __NoValue:
+                    line, col = streamer._mark_position()
+                    raise SyntaxError(
+                        "Invalid Complex expression: line={}, col={}".format(
+                            line, col
+                        )
+                    )
+            elif type(tkn) is Array:
+                if streamer.lookahead_token is __LPar:
+                    _ = _next_token(streamer)
+                    stack.append((__F_ARRAY, tkn))
+                    stack.append([__F_LIST, [], _NIL, 0])
+                    continue
                 _ = _next_token(streamer)
+                line, col = streamer._mark_position()
                 raise SyntaxError(
-                    "')' is expected: line={}, col={}".format(
-                        streamer.line, streamer.col
+                    "Invalid Array expression: line={}, col={}".format(line, col)
+                )
+            else:
+                line, col = streamer._mark_position()
+                raise SyntaxError(
+                    "Unexpected token '{}': line={}, col={}".format(
+                        _TOKEN_NAMES.get(tkn, tkn), line, col
                     )
                 )
-            break
-        c.cdr = Cons(_sxpr_read_obj(streamer))
-        c = c.cdr
-    _ = _next_token(streamer)  # Skip ')'
-    return ret
+        # feed the value to the enclosing frame, resolving any
+        # prefixes; an empty stack means the expression is complete
+        while stack:
+            f = stack.pop()
+            op = f[0]
+            if op == __F_QUOTE:
+                v = Cons(f[1], Cons(v))
+            elif op == __F_ARRAY:
+                f[1].value = v
+                v = f[1]
+            else:
+                stack.append(f)
+                if f[3] == 0:
+                    f[1].append(v)
+                else:
+                    f[2] = v
+                    f[3] = 2
+                break
+        else:
+            return v
 
 
 # ------------------------------- Streamer
@@ -1379,27 +1885,93 @@ class SxprStreamerBaseClass:
 
     def read(self):
         v = self.lookahead_char
-        if self.lookahead_char != "":
+        if v != "":
             self.lookahead_char = self._getchar()
-        if v in {"\r", "\n"}:
-            self.lookahead_col = 0
-            self.lookahead_line = self.lookahead_line + 1
-        elif v != "":
-            self.lookahead_col = (
-                self.lookahead_col + eawcolumncount[_east_asian_width(v)]
-            )
+            o = ord(v)
+            if o == 10 or o == 13:  # "\n" / "\r" both start a new line
+                self.lookahead_col = 0
+                self.lookahead_line = self.lookahead_line + 1
+            else:
+                self.lookahead_col = self.lookahead_col + eawcolumncount[
+                    _EAW_ASCII[o] if o < 128 else _eaw(v)
+                ]
         return v
 
+    def _scan(self, matcher):
+        # bulk-consume a run of characters matched by one of the _*_RUN
+        # patterns above; only streamers backed by a random-access string
+        # can do this, so the default is "not supported" and the caller
+        # falls back to read()-ing one character at a time
+        return None
+
+    def _mark(self):
+        # snapshot the position at which the last token ended; error
+        # messages retrieve it later through _mark_position()
+        self.line = self.lookahead_line
+        self.col = self.lookahead_col
+
+    def _mark_position(self):
+        return self.line, self.col
+
+    def _scan_count(self, consumed):
+        # advance the line/column counters over a bulk-consumed run
+        # exactly as the equivalent read() loop would: both "\r" and
+        # "\n" start a new line
+        nl = consumed.count("\n") + consumed.count("\r")
+        if nl > 0:
+            self.lookahead_line = self.lookahead_line + nl
+            self.lookahead_col = 0
+            i = max(consumed.rfind("\n"), consumed.rfind("\r"))
+            consumed = consumed[i + 1 :]
+        n = self.lookahead_col
+        for v in consumed:
+            o = ord(v)
+            n = n + eawcolumncount[_EAW_ASCII[o] if o < 128 else _eaw(v)]
+        self.lookahead_col = n
 
-# read a character from file and return it one by one
+
+# read characters from a file, served out of a fixed-size block buffer
+# so that each character costs an index instead of an fd.read(1) call
 class _FileStreamer(SxprStreamerBaseClass):
+    __BUFSIZE = 1 << 16
+
     def __init__(self, fd):
         self.__fd = fd
+        self.__buf = ""
+        self.__bpos = 0
         super().__init__()  # <- required
 
     def _getchar(self):
-        ret = self.__fd.read(1)
-        return ret
+        buf = self.__buf
+        i = self.__bpos
+        if i >= len(buf):
+            buf = self.__fd.read(self.__BUFSIZE)
+            if buf == "":
+                return ""
+            self.__buf = buf
+            i = 0
+        self.__bpos = i + 1
+        return buf[i]
+
+    def _scan(self, matcher):
+        # like _StringStreamer._scan, but restricted to the buffered
+        # block; a match reaching the end of the buffer might continue
+        # in the next block, so that case bails out to the caller's
+        # per-character path
+        if self.lookahead_char == "":
+            return None
+        buf = self.__buf
+        pos = self.__bpos - 1
+        m = matcher(buf, pos)
+        if m is None:
+            return None
+        end = m.end()
+        if end >= len(buf):
+            return None
+        self._scan_count(buf[pos:end])
+        self.lookahead_char = buf[end]
+        self.__bpos = end + 1
+        return m
 
 
 # read a character from text string and return it one by one
@@ -1410,6 +1982,7 @@ class _StringStreamer(SxprStreamerBaseClass):
         self.__text = text
         self.__length = len(text)
         self.__index = 0
+        self.__mark = 0
         super().__init__()  # <- required
 
     def _getchar(self):
@@ -1420,6 +1993,58 @@ class _StringStreamer(SxprStreamerBaseClass):
             v = ""
         return v
 
+    def read(self):
+        # per-character line/column counting is the dominant cost of
+        # reading from a string, and positions are only ever needed for
+        # error messages; skip the bookkeeping here and recompute it
+        # from the text in _mark_position() on demand
+        v = self.lookahead_char
+        if v != "":
+            self.lookahead_char = self._getchar()
+        return v
+
+    def _mark(self):
+        # remember the text offset of the lookahead character
+        if self.lookahead_char != "":
+            self.__mark = self.__index - 1
+        else:
+            self.__mark = self.__index
+
+    def _mark_position(self):
+        # derive line/column of the marked offset from the text,
+        # counting lines the same way the eager counters do ("\r" and
+        # "\n" each start a new line)
+        t = self.__text
+        p = self.__mark
+        line = 1 + t.count("\n", 0, p) + t.count("\r", 0, p)
+        i = t.rfind("\n", 0, p)
+        j = t.rfind("\r", 0, p)
+        if j > i:
+            i = j
+        col = 0
+        for v in t[i + 1 : p]:
+            o = ord(v)
+            col = col + eawcolumncount[_EAW_ASCII[o] if o < 128 else _eaw(v)]
+        return line, col
+
+    def _scan(self, matcher):
+        # the next unread character is the lookahead one, i.e. the text
+        # position just before __index
+        if self.lookahead_char == "":
+            return None
+        pos = self.__index - 1
+        m = matcher(self.__text, pos)
+        if m is None:
+            return None
+        end = m.end()
+        if end < self.__length:
+            self.lookahead_char = self.__text[end]
+            self.__index = end + 1
+        else:
+            self.lookahead_char = ""
+            self.__index = end
+        return m
+
 
 # ------------------------------- S-expression Reader class
 
@@ -1497,7 +2122,6 @@ class sxopen:
         if self.__fd is not None:
             self.__fd.close()
             self.__fd = None
-            del self.__reader
             self.__reader = None
 
     def read(self):